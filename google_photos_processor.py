@@ -8,6 +8,7 @@ Changes requested:
 3. Keep all previous matching logic intact.
 4. Mirror console output to a timestamped log file located in the input folder.
 5. FIX: Handle AVI and other video formats that don't support EXIF writing
+6. Keep ExifTool processes open (-stay_open) instead of spawning one per file, one per CPU core
 
 Requirements:
 - Python ≥ 3.9 (for zoneinfo)
@@ -19,281 +20,395 @@ Usage:
 import argparse
 import json
 import logging
-import re
+import logging.handlers
+import os
+import queue
 import shutil
 import subprocess
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+try:
+    import fcntl  # not available on Windows
+except ImportError:
+    fcntl = None
+
+from rich.console import Console
+from rich.logging import RichHandler
+from rich.progress import BarColumn, Progress, TextColumn
+
+from json_matcher import JsonIndex, get_rule_description, get_total_rule_count, local_date, match_json, scan_tree
+
 DEFAULT_TZ = "America/Los_Angeles"
-UTC = ZoneInfo("UTC")
+# Options shared by every ExifTool command
+EXIFTOOL_COMMON_ARGS = ("-q", "-m", "-charset", "filename=utf8")
+DATE_TAGS = ("-DateTimeOriginal=", "-CreateDate=", "-ModifyDate=", "-FileModifyDate=", "-FileCreateDate=")
+# Formats that ExifTool can write metadata to
+WRITABLE_FORMATS = frozenset({
+    ".360", ".3g2", ".3gp", ".aax", ".ai", ".arq", ".arw", ".avif",
+    ".cr2", ".cr3", ".crm", ".crw", ".cs1", ".dcp", ".dng", ".dr4",
+    ".dvb", ".eps", ".erf", ".exif", ".exv", ".f4a", ".f4v", ".fff",
+    ".flif", ".gif", ".glv", ".gpr", ".hdp", ".heic", ".heif", ".icc",
+    ".iiq", ".ind", ".insp", ".jng", ".jp2", ".jpeg", ".jpg", ".jxl",
+    ".lrv", ".m4a", ".m4v", ".mef", ".mie", ".mng", ".mos", ".mov",
+    ".mp4", ".mpo", ".mqv", ".mrw", ".nef", ".nksc", ".nrw", ".orf",
+    ".ori", ".pbm", ".pdf", ".pef", ".pgm", ".png", ".ppm", ".ps",
+    ".psb", ".psd", ".qtif", ".raf", ".raw", ".rw2", ".rwl", ".sr2",
+    ".srw", ".thm", ".tif", ".tiff", ".vrd", ".wdp", ".webp", ".x3f",
+    ".xmp"
+})
+# Per-file outcomes returned by _process_file
+PROCESSED = "processed"
+COPIED_ONLY = "copied_only"
+SKIPPED = "skipped"
+# Per-year list files written by GooglePhotosProcessor: {year}_<kind>.txt
+LIST_LABELS = {"skipped_files": "Skipped", "copied_only": "Copied only"}
+LOG_LEVELS = {"INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+
+logger = logging.getLogger(__name__)
+# FICLONE (reflink) ioctl, exposed by the fcntl module on Python 3.12+ (Linux)
+_FICLONE = getattr(fcntl, "FICLONE", None)
+
+def _copy_file(src, dst):
+    """Copy file data from src to dst (times and metadata are not copied).
+
+    On filesystems with reflink support (btrfs, XFS) the data is cloned instead
+    of copied; otherwise shutil.copyfile uses the kernel fast path where available.
+    """
+    global _FICLONE
+    # Read the global once: another worker may reset it to None at any moment
+    ficlone = _FICLONE
+    if ficlone is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), ficlone, fsrc.fileno())
+            return
+        except OSError:
+            # Unsupported filesystem (or cross-device): stop trying for the rest of the run
+            _FICLONE = None
+    shutil.copyfile(src, dst)
+
+class ExifToolDaemon:
+    """Single long-lived ExifTool process driven through ``-stay_open``.
+
+    Starting exiftool.exe (Perl interpreter + modules) costs far more than
+    writing tags to one file, so one process is kept open and fed one
+    command at a time through an argument file on stdin.
+
+    A bulk ``-csv=`` import per folder was considered and not used: it needs the
+    files copied first and then rewritten in place (two writes instead of one
+    ``-o`` pass), and it reports one status for the whole batch, which would lose
+    the per-file fallback to a plain copy.
+    """
+    READY = b"{ready}"
+    # -echo4 is written to stderr after the command finishes, so it both
+    # frames stderr and carries the exit status of the command.
+    _TRAILER = b"\n-echo4\n${status}" + READY + b"\n-execute\n"
+
+    def __init__(self, exiftool_path: str, common_args=EXIFTOOL_COMMON_ARGS):
+        # -common_args are appended to every command by ExifTool itself, so
+        # they are never re-sent per file. Pipes are binary: stderr is only
+        # decoded when a command fails.
+        self.proc = subprocess.Popen(
+            [exiftool_path, "-stay_open", "True", "-@", "-", "-common_args", *common_args],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Don't allocate a console window for the child on Windows
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+
+    @staticmethod
+    def _arg_line(arg: str) -> str:
+        """Encode one argument as an argument-file line.
+
+        The argument file holds one argument per line, so a raw newline in a value
+        from the JSON (e.g. a multi-line description) would split it into extra
+        arguments. #[CSTR] lines are read as C strings, so newlines, carriage
+        returns and backslashes are sent escaped and arrive unchanged.
+        """
+        return "#[CSTR]" + arg.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+    def run(self, args: list[str]) -> tuple[int, str]:
+        """Execute one command and return (exit status, stderr output on failure)."""
+        self.proc.stdin.write("\n".join(map(self._arg_line, args)).encode("utf-8") + self._TRAILER)
+        self.proc.stdin.flush()
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                raise RuntimeError("ExifTool exited unexpectedly.")
+            if line.rstrip(b"\r\n") == self.READY:
+                break
+        errors = []
+        while True:
+            line = self.proc.stderr.readline()
+            if not line:
+                raise RuntimeError("ExifTool exited unexpectedly.")
+            line = line.rstrip(b"\r\n")
+            if line.endswith(self.READY):
+                status = line[:-len(self.READY)]
+                break
+            errors.append(line)
+        status = int(status) if status.isdigit() else 1
+        if status == 0:
+            return 0, ""
+        return status, b"\n".join(errors).decode("utf-8", errors="replace")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Ask ExifTool to exit and wait for it."""
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write(b"-stay_open\nFalse\n")
+                self.proc.stdin.flush()
+            except OSError:
+                pass
+        self.proc.communicate()
 
 class GooglePhotosProcessor:
     def __init__(self, base: Path, output: Path | None, time_zone: str = DEFAULT_TZ):
         self.base = base
         self.out_base = output if output else base / "processed"
-        self.skipped: list[str] = []
+        # Open per-year skipped/copied-only lists, keyed by file kind (see _append_to_list)
+        self._list_files = {}
+        self._year = None
         self.processed = 0
         self.copied_only = 0  # Files copied without metadata embedding
         self.time_zone = ZoneInfo(time_zone)
+        # One ExifTool daemon per CPU core
+        self.workers = os.cpu_count() or 1
+        # Extra threads for copy-only files (and the JSON reads/copies around ExifTool
+        # calls), so plain file I/O overlaps ExifTool work instead of holding a daemon's slot
+        self.pool_size = self.workers * 2
         # For per-folder stats
         self._reset_folder_stats()
 
     def _reset_folder_stats(self):
-        from json_matcher import get_total_rule_count
         self.folder_processed = 0
         self.folder_copied_only = 0
         self.folder_skipped = 0
         num_rules = get_total_rule_count()
         self.folder_rule_counts = {i: 0 for i in range(1, num_rules + 1)}
-    JSON_LENGTH_LIMIT = 50  # Max length of JSON filename (incl. .json)
-    
-    # Formats that ExifTool can write metadata to
-    WRITABLE_FORMATS = {
-        ".360", ".3g2", ".3gp", ".aax", ".ai", ".arq", ".arw", ".avif",
-        ".cr2", ".cr3", ".crm", ".crw", ".cs1", ".dcp", ".dng", ".dr4",
-        ".dvb", ".eps", ".erf", ".exif", ".exv", ".f4a", ".f4v", ".fff",
-        ".flif", ".gif", ".glv", ".gpr", ".hdp", ".heic", ".heif", ".icc",
-        ".iiq", ".ind", ".insp", ".jng", ".jp2", ".jpeg", ".jpg", ".jxl",
-        ".lrv", ".m4a", ".m4v", ".mef", ".mie", ".mng", ".mos", ".mov",
-        ".mp4", ".mpo", ".mqv", ".mrw", ".nef", ".nksc", ".nrw", ".orf",
-        ".ori", ".pbm", ".pdf", ".pef", ".pgm", ".png", ".ppm", ".ps",
-        ".psb", ".psd", ".qtif", ".raf", ".raw", ".rw2", ".rwl", ".sr2",
-        ".srw", ".thm", ".tif", ".tiff", ".vrd", ".wdp", ".webp", ".x3f",
-        ".xmp"
-    }
+
+    # ---------- counters (main thread only; workers return an outcome instead) ----------
+    def _mark_processed(self):
+        self.processed += 1
+        self.folder_processed += 1
+
+    def _mark_copied_only(self, media: Path):
+        self.copied_only += 1
+        self.folder_copied_only += 1
+        self._append_to_list("copied_only", media)
+
+    def _mark_skipped(self, media: Path | str):
+        self._append_to_list("skipped_files", media)
+        self.folder_skipped += 1
+
+    def _mark(self, media: Path, outcome: str):
+        if outcome == PROCESSED:
+            self._mark_processed()
+        elif outcome == COPIED_ONLY:
+            self._mark_copied_only(media)
+        else:
+            self._mark_skipped(media)
+
+    # ---------- per-year file lists ----------
+    def _append_to_list(self, kind: str, media: Path):
+        """Append media to {year}_{kind}.txt; the file is only created once it has an entry."""
+        f = self._list_files.get(kind)
+        if f is None:
+            f = self._list_files[kind] = open(self.base / f"{self._year}_{kind}.txt", "w", encoding="utf-8")
+        f.write(f"{media}\n")
+
+    def _close_lists(self):
+        for kind, f in self._list_files.items():
+            f.close()
+            self.log_message("INFO", f"{LIST_LABELS[kind]} list written to {f.name}")
+        self._list_files = {}
 
     # ---------- logging ----------
     def _setup_logging(self):
-        log_file = self.base / f"gp_processor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        now = datetime.now()
+        log_file = self.base / f"gp_processor_{now.strftime('%Y%m%d_%H%M%S')}.log"
         self.log_file_path = log_file
-        # Write initial log line
+        # Write initial log line (file only, do not print to console here)
+        timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
         with open(self.log_file_path, "a", encoding="utf-8") as f:
-            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} INFO | Logging to {log_file}\n")
-            f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} INFO | ==============================\n")
-        from rich.console import Console
+            f.write(f"{timestamp} INFO | Logging to {log_file}\n")
+            f.write(f"{timestamp} INFO | ==============================\n")
         self.console = Console()
-        # Do not print to console here
-
-    def log_message(self, level: str, message: str, progress=None):
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_line = f"{timestamp} {level.upper()} | {message}"
-        if progress is not None:
-            progress.console.print(log_line)
-        else:
-            self.console.print(log_line)
-        if self.log_file_path:
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(log_line + "\n")
-
-    # ---------- utilities ----------
-    def _json_time_to_local(self, ts: str | int) -> str:
-        """Convert Unix-timestamp-in-UTC → formatted local-time string."""
-        try:
-            dt_utc = datetime.fromtimestamp(int(ts), tz=UTC)
-            dt_local = dt_utc.astimezone(self.time_zone)
-            return dt_local.strftime("%Y:%m:%d %H:%M:%S")
-        except Exception:
-            return ""
+        # Configured once per run: rich console (also used by the progress bar) + log file
+        formatter = logging.Formatter("%(asctime)s %(levelname)s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        console_handler = RichHandler(console=self.console, show_time=False, show_level=False, show_path=False)
+        file_handler = self._log_file_handler = logging.FileHandler(self.log_file_path, encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        console_handler.setFormatter(formatter)
+        # There are several log lines per media file; buffer them and write in batches,
+        # flushing straight away on WARNING/ERROR and at the end of every year folder
+        self._log_buffer = logging.handlers.MemoryHandler(1024, flushLevel=logging.WARNING, target=file_handler)
+        logger.handlers.clear()
+        logger.addHandler(console_handler)
+        logger.addHandler(self._log_buffer)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    def log_message(self, level: str, message: str):
+        """Log through the module logger; also used as json_matcher's log_func."""
+        logger.log(LOG_LEVELS[level.upper()], message)
 
     # ---------- folder discovery ----------
     def _year_folders(self):
-        pat = re.compile(r"^Photos from (\d{4})$", re.IGNORECASE)
+        """Yield (folder, "YYYY") for each "Photos from YYYY" folder.
+
+        Plain string checks instead of a regex; the name is tested before is_dir() stats it.
+        """
         for p in self.base.iterdir():
-            if p.is_dir() and pat.match(p.name):
-                yield p
+            name = p.name
+            if len(name) == 16 and name[:12].lower() == "photos from " and name[12:].isdecimal() and p.is_dir():
+                yield p, name[12:]
 
 
     # ---------- exiftool command ----------
-    def _build_cmd(self, meta: dict, target_path: Path):
-        """Build exiftool command for embedding metadata - FIXED VERSION"""
-        # Find exiftool executable (support exiftool(-k).exe and exiftool.exe)
-        import shutil
-        exiftool_path = shutil.which("exiftool.exe")
-        if not exiftool_path:
-            if shutil.which("exiftool(-k).exe"):
-                raise RuntimeError("Found exiftool(-k).exe, but this version is not supported for scripting. Please rename it to exiftool.exe and try again.")
-            raise RuntimeError("ExifTool executable not found. Please ensure exiftool.exe is in your PATH.")
-        cmd = [
-            exiftool_path,
-            "-overwrite_original",
-            "-q",
-            "-m",
-        ]
+    def _build_cmd(self, meta: dict, date_str: str):
+        """Build the ExifTool tag arguments for embedding metadata."""
+        # Static options (-q, -m) are sent once per daemon via -common_args
+        cmd = []
         
         # Dates
-        date_str = ""
-        if ts := meta.get("photoTakenTime", {}).get("timestamp"):
-            date_str = self._json_time_to_local(ts)
-        elif ts := meta.get("creationTime", {}).get("timestamp"):
-            date_str = self._json_time_to_local(ts)
         if date_str:
-            cmd += [
-                f"-DateTimeOriginal={date_str}",
-                f"-CreateDate={date_str}",
-                f"-ModifyDate={date_str}",
-                f"-FileModifyDate={date_str}",
-                f"-FileCreateDate={date_str}",
-            ]
+            cmd.extend(tag + date_str for tag in DATE_TAGS)
         
         # GPS
         geo = meta.get("geoData", {})
         if geo.get("latitude") or geo.get("longitude"):
-            cmd += [
-                f"-GPSLatitude={geo.get('latitude', 0)}",
-                f"-GPSLongitude={geo.get('longitude', 0)}",
-            ]
+            cmd.append(f"-GPSLatitude={geo.get('latitude', 0)}")
+            cmd.append(f"-GPSLongitude={geo.get('longitude', 0)}")
             if alt := geo.get("altitude"):
                 cmd.append(f"-GPSAltitude={alt}")
         
         # People
-        names = "; ".join(p.get("name", "") for p in meta.get("people", []) if p.get("name"))
-        if names:
-            cmd += [f"-Keywords={names}", f"-Subject={names}"]
+        if names := [n for p in meta.get("people") or () if (n := p.get("name"))]:
+            names = "; ".join(names)
+            cmd.append(f"-Keywords={names}")
+            cmd.append(f"-Subject={names}")
         
         # Description
         if desc := meta.get("description"):
             cmd.append(f"-ImageDescription={desc}")
         
-        # Target file (NOT using -o= which causes the error)
-        cmd.append(str(target_path))
-        
         return cmd
 
+    def _run_exiftool(self, args: list[str]) -> tuple[int, str]:
+        """Run one ExifTool command on whichever daemon is free."""
+        daemon = self._daemons.get()
+        try:
+            return daemon.run(args)
+        finally:
+            self._daemons.put(daemon)
+
     # ---------- processing ----------
-    def _process_file(self, media: Path, jpath: Path, progress=None):
-        from json_matcher import load_json
-        meta = load_json(jpath, log_func=self.log_message)
+    def _process_file(self, media: Path, jpath: Path, file_ext: str, json_index: JsonIndex):
+        """Copy media into YYYY/MM and embed its metadata; file_ext is the lowercase suffix.
+
+        Runs on a worker thread and returns PROCESSED, COPIED_ONLY or SKIPPED for
+        the main thread to count.
+        """
+        # Reuses the parse if matching (Rule 7) already read this JSON
+        meta = json_index.load(jpath, self.log_message, store=False)
         if not meta:
-            self.skipped.append(str(media))
-            self.folder_skipped += 1
-            self.log_message("WARNING", f"Skip {media.name} (bad JSON)", progress=progress)
-            return
+            self.log_message("WARNING", f"Skip {media.name} (bad JSON)")
+            return SKIPPED
         # Determine target subdir from Pacific date
         ts = meta.get("photoTakenTime", {}).get("timestamp") or meta.get("creationTime", {}).get("timestamp")
         if not ts:
-            self.skipped.append(str(media))
-            self.folder_skipped += 1
-            self.log_message("WARNING", f"Skip {media.name} (no timestamp)", progress=progress)
-            return
-        dt = datetime.fromtimestamp(int(ts), tz=UTC).astimezone(self.time_zone)
-        target_dir = self.out_base / str(dt.year) / f"{dt.month:02d}"
-        target_dir.mkdir(parents=True, exist_ok=True)
+            self.log_message("WARNING", f"Skip {media.name} (no timestamp)")
+            return SKIPPED
+        # Convert once; reused for the folder and the ExifTool dates
+        epoch = int(ts)
+        date_str, year, month = local_date(epoch, self.time_zone)
+        # File times are stored as UTC epoch values, which is what the JSON already holds;
+        # integer nanoseconds avoid the float conversion os.utime does for seconds
+        mod_time_ns = epoch * 1_000_000_000
+        target_dir = self.out_base / year / month
+        # Only the first file of each month pays for the mkdir syscall(s). No lock needed:
+        # set operations are atomic and mkdir(exist_ok=True) tolerates a racing thread.
+        target_dir_str = str(target_dir)
+        if target_dir_str not in self._created_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(target_dir_str)
         target = target_dir / media.name
-        # Copy file to destination first
-        shutil.copy2(media, target)
         # Check if this format supports metadata writing
-        file_ext = media.suffix.lower()
-        if file_ext not in self.WRITABLE_FORMATS:
+        if file_ext not in WRITABLE_FORMATS:
+            # Times are set just below, so copy2's copystat() would be wasted work
+            _copy_file(media, target)
+            shutil.copymode(media, target)
             # For formats that don't support metadata, update modified date using os.utime
             try:
-                # Get Pacific time as datetime object
-                local_dt = datetime.fromtimestamp(int(ts), tz=UTC).astimezone(self.time_zone)
-                # Convert to timestamp (seconds since epoch)
-                mod_time = local_dt.timestamp()
                 # Set both access and modified time
-                import os
-                os.utime(target, (mod_time, mod_time))
-                self.log_message("INFO", f"Updated modified date only (format doesn't support metadata): {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
+                os.utime(target, ns=(mod_time_ns, mod_time_ns))
+                self.log_message("INFO", f"Updated modified date only (format doesn't support metadata): {media.name} → {year}/{month}")
             except Exception as e:
-                self.log_message("WARNING", f"Failed to update modified date for {media.name}: {e}", progress=progress)
-            self.copied_only += 1
-            self.folder_copied_only += 1
-            if hasattr(self, 'copied_only_files'):
-                self.copied_only_files.append(str(media))
-            return
-        
-        if file_ext in self.WRITABLE_FORMATS:
-            # Try to embed metadata for supported formats
-            cmd = self._build_cmd(meta, target)
-            res = subprocess.run(cmd, capture_output=True, text=True)
-
-            if res.returncode == 0:
-                self.processed += 1
-                self.folder_processed += 1
-                self.log_message("INFO", f"Processed with metadata: {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
-            else:
-                self.copied_only += 1
-                self.folder_copied_only += 1
-                if hasattr(self, 'copied_only_files'):
-                    self.copied_only_files.append(str(media))
-                # Log ExifTool error output for debugging
-                error_output = res.stderr.strip() if res.stderr else "No error output."
-                self.log_message("ERROR", f"ExifTool failed for {media.name}: {error_output}", progress=progress)
-                # Update modified time for copied only files (even for writable formats)
-                try:
-                    local_dt = datetime.fromtimestamp(int(ts), tz=UTC).astimezone(self.time_zone)
-                    mod_time = local_dt.timestamp()
-                    import os
-                    os.utime(target, (mod_time, mod_time))
-                    self.log_message("WARNING", f"Updated modified date only (metadata embedding failed): {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
-                except Exception as e:
-                    self.log_message("WARNING", f"Copied only (metadata embedding failed): {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
+                self.log_message("WARNING", f"Failed to update modified date for {media.name}: {e}")
+            return COPIED_ONLY
+
+        # Let ExifTool copy and embed metadata in one pass (-o) instead of copying
+        # first and rewriting the copy; -o refuses to replace an existing file.
+        target.unlink(missing_ok=True)
+        cmd = self._build_cmd(meta, date_str)
+        cmd += ("-o", str(target), str(media))
+        status, stderr = self._run_exiftool(cmd)
+
+        if status == 0:
+            self.log_message("INFO", f"Processed with metadata: {media.name} → {year}/{month}")
+            return PROCESSED
         else:
-            # Unknown format - try to embed metadata but don't fail if it doesn't work
-            cmd = self._build_cmd(meta, target)
-            res = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if res.returncode == 0:
-                self.processed += 1
-                self.folder_processed += 1
-                self.log_message("INFO", f"Processed with metadata: {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
-            else:
-                self.copied_only += 1
-                self.folder_copied_only += 1
-                if hasattr(self, 'copied_only_files'):
-                    self.copied_only_files.append(str(media))
-                # Update modified time for copied only files (unknown formats)
-                try:
-                    local_dt = datetime.fromtimestamp(int(ts), tz=UTC).astimezone(self.time_zone)
-                    mod_time = local_dt.timestamp()
-                    import os
-                    os.utime(target, (mod_time, mod_time))
-                    self.log_message("INFO", f"Updated modified date for copied only file: {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
-                except Exception as e:
-                    self.log_message("WARNING", f"Failed to update modified date for {media.name}: {e}", progress=progress)
-                self.log_message("INFO", f"Copied only (metadata not supported): {media.name} → {dt.year}/{dt.month:02d}", progress=progress)
-
-    def _process_folder(self, year_folder: Path, process_files_set=None):
-        from rich.progress import Progress, BarColumn, TextColumn, TimeRemainingColumn
-        from datetime import timedelta
-        # Use self.console for both progress and logging
-        json_files = list(year_folder.rglob("*.json"))
-        media_files = [p for p in year_folder.rglob("*") if p.suffix.lower() != ".json"]
-
-        # If process_files_set is specified, filter media_files by file name only
-        if process_files_set is not None:
-            media_files = [p for p in media_files if p.name in process_files_set]
+            # Log ExifTool error output for debugging
+            error_output = stderr.strip() or "No error output."
+            self.log_message("ERROR", f"ExifTool failed for {media.name}: {error_output}")
+            # Fall back to a plain copy and update modified time (even for writable formats).
+            # Data only; the times are set below.
+            _copy_file(media, target)
+            try:
+                os.utime(target, ns=(mod_time_ns, mod_time_ns))
+                self.log_message("WARNING", f"Updated modified date only (metadata embedding failed): {media.name} → {year}/{month}")
+            except Exception as e:
+                self.log_message("WARNING", f"Copied only (metadata embedding failed): {media.name} → {year}/{month}")
+            return COPIED_ONLY
 
-        # Track copied only files for this folder
-        self.copied_only_files = []
+    def _process_folder(self, year_folder: Path, year_str: str, process_files_set=None):
+        # Use self.console for both progress and logging
+        json_files = []
+        media_files = []  # (DirEntry, lowercase suffix); a Path is only built for files handed to a worker
+        for entry in scan_tree(year_folder):
+            _, dot, ext = entry.name.rpartition(".")
+            ext = dot + ext.lower()
+            if ext == ".json":
+                json_files.append(Path(entry.path))
+            # If process_files_set is specified, filter media_files by file name only
+            elif process_files_set is None or entry.name in process_files_set:
+                media_files.append((entry, ext))
+        # Built once per folder so match_json does lookups instead of scanning json_files
+        json_index = JsonIndex(json_files)
 
         self._reset_folder_stats()
 
         total_files = len(media_files)
-        year_str = None
-        m = re.match(r"^Photos from (\d{4})$", year_folder.name, re.IGNORECASE)
-        if m:
-            year_str = m.group(1)
-        if year_str:
-            self.console.print(f"\nProcessing {year_str}....")
-
-        # Custom logging handler for rich Console
-        class RichLoggingHandler(logging.Handler):
-            def emit(self, record):
-                msg = self.format(record)
-                self.console.print(msg)
-        for handler in logging.root.handlers[:]:
-            logging.root.removeHandler(handler)
-        logging.basicConfig(handlers=[RichLoggingHandler()], level=logging.INFO, format='%(asctime)s %(levelname)s | %(message)s', force=True)
-
-        progress_label = f"{year_str} Processing" if year_str else "Processing"
+        self.console.print(f"\nProcessing {year_str}....")
+
+        progress_label = f"{year_str} Processing"
         def format_time_remaining(seconds):
             if seconds is None or seconds < 0:
                 return "N/A"
-            from datetime import timedelta
             return str(timedelta(seconds=int(seconds)))
 
         with Progress(
@@ -303,89 +418,121 @@ class GooglePhotosProcessor:
             TextColumn("| Files processed: {task.completed}/{task.total} | Time remaining: {task.fields[time_fmt]}", justify="left", style="progress.remaining"),
             console=self.console,
             transient=False,
-        ) as progress:
+        ) as progress, ThreadPoolExecutor(max_workers=self.pool_size) as pool:
             task = progress.add_task(progress_label, total=total_files, time_fmt="N/A")
-            from json_matcher import match_json
-            for media in media_files:
-                matches = match_json(media, json_files, log_func=self.log_message, rule_counts=self.folder_rule_counts)
-                if len(matches) == 1:
-                    self._process_file(media, matches[0], progress=progress)
-                else:
-                    self.skipped.append(str(media))
-                    self.folder_skipped += 1
-                    self.log_message("WARNING", f"Skip {media.name} (no or multi JSON)", progress=progress)
-                # Update time remaining field
-                current_task = progress.tasks[task]
-                progress.update(task, advance=1, time_fmt=format_time_remaining(current_task.time_remaining))
+
+            # Re-rendering the bar on every file is not free; push updates in batches
+            pending = 0
+            last_update = time.monotonic()
+
+            def advance(flush=False):
+                nonlocal pending, last_update
+                if not flush:
+                    pending += 1
+                now = time.monotonic()
+                if pending and (flush or pending >= 16 or now - last_update >= 0.1):
+                    # Update time remaining field
+                    current_task = progress.tasks[task]
+                    progress.update(task, advance=pending, time_fmt=format_time_remaining(current_task.time_remaining))
+                    pending = 0
+                    last_update = now
+
+            # Matching stays on this thread (it updates the rule counters); copy + ExifTool run on the pool
+            futures = {}
+            try:
+                for entry, file_ext in media_files:
+                    # match_json only needs .name, which DirEntry already has
+                    matches = match_json(entry, json_files, log_func=self.log_message, rule_counts=self.folder_rule_counts, json_index=json_index)
+                    if len(matches) == 1:
+                        media = Path(entry.path)
+                        futures[pool.submit(self._process_file, media, matches[0], file_ext, json_index)] = media
+                    else:
+                        self._mark_skipped(entry.path)
+                        self.log_message("WARNING", f"Skip {entry.name} (no or multi JSON)")
+                        advance()
+                # Workers only report outcomes; counters are updated here, so they need no lock
+                for future in as_completed(futures):
+                    self._mark(futures[future], future.result())
+                    advance()
+            except BaseException:
+                # A worker error or Ctrl-C: drop the queued files instead of letting the
+                # pool finish the whole year (their outcomes would never be recorded)
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            advance(flush=True)
 
     # ---------- run ----------
     def run(self):
         self._setup_logging()
-        # Check for exiftool.exe only
-        import shutil
-        if not shutil.which("exiftool.exe"):
-            if shutil.which("exiftool(-k).exe"):
-                self.log_message("ERROR", "Please exiftool(-k).exe, please rename to exiftool.exe and try again.")
-            else:
-                self.log_message("ERROR", "ExifTool not found in PATH. Please ensure exiftool.exe is available.")
-            return 1
-
-        self.out_base.mkdir(parents=True, exist_ok=True)
-
-        # Track skipped and copied only files per year
-        skipped_by_year = {}
-        copied_only_by_year = {}
-
-        for yf in self._year_folders():
-            self.log_message("INFO", "==============================")
-            self.log_message("INFO", f"START PROCESSING YEAR FOLDER: {yf.name}")
-            self.log_message("INFO", "==============================")
-            # Extract year from folder name
-            m = re.match(r"^Photos from (\d{4})$", yf.name, re.IGNORECASE)
-            year = m.group(1) if m else None
-
-            # If skipped_files_folder is specified, check for YYYY_skipped_files.txt
-            process_files_set = None
-            if hasattr(self, '_skipped_files_folder') and self._skipped_files_folder and year:
-                skipped_file_path = self._skipped_files_folder / f"{year}_skipped_files.txt"
-                if not skipped_file_path.exists():
-                    self.log_message("INFO", f"Skipped file list {skipped_file_path} not found. Skipping folder {yf.name}.")
-                    continue
-                # Read only file names from the skipped file list
-                with open(skipped_file_path, 'r', encoding='utf-8') as f:
-                    process_files_set = set(Path(line.strip()).name for line in f if line.strip())
-
-            # Clear skipped and copied only for each year folder
-            self.skipped = []
-            self.copied_only_files = []
-            self._reset_folder_stats()
-            self._process_folder(yf, process_files_set)
-            if year:
-                if self.skipped:
-                    skipped_by_year[year] = list(self.skipped)
-                    # Write per-year skipped file
-                    skipped_path = self.base / f"{year}_skipped_files.txt"
-                    skipped_path.write_text("\n".join(self.skipped), encoding="utf-8")
-                    self.log_message("INFO", f"Skipped list written to {skipped_path}")
-                if self.copied_only_files:
-                    copied_only_by_year[year] = list(self.copied_only_files)
-                    copied_only_path = self.base / f"{year}_copied_only.txt"
-                    copied_only_path.write_text("\n".join(self.copied_only_files), encoding="utf-8")
-                    self.log_message("INFO", f"Copied only list written to {copied_only_path}")
-                self.log_message("INFO", f"YEAR {year} SUMMARY:")
-                self.log_message("INFO", f"  Processed with metadata: {self.folder_processed}")
-                self.log_message("INFO", f"  Copied only: {self.folder_copied_only}")
-                self.log_message("INFO", f"  Skipped: {self.folder_skipped}")
-                from json_matcher import get_rule_description, get_total_rule_count
-                num_rules = get_total_rule_count()
-                for rule_num in range(1, num_rules + 1):
-                    desc = get_rule_description(rule_num)
-                    self.log_message("INFO", f"  Rule {rule_num} ({desc}) match count: {self.folder_rule_counts.get(rule_num, 0)}")
-        total_skipped = sum(len(v) for v in skipped_by_year.values())
-        total_copied_only = sum(len(v) for v in copied_only_by_year.values())
-        self.log_message("INFO", f"COMPLETED PROCESSING. Total processed with metadata={self.processed}  Copied only (no metadata update)={self.copied_only}  Skipped={total_skipped}")
-
-        return 0
+        try:
+            # Check for exiftool.exe only; resolved once and reused for every daemon
+            self._exiftool_path = shutil.which("exiftool.exe")
+            if not self._exiftool_path:
+                if shutil.which("exiftool(-k).exe"):
+                    self.log_message("ERROR", "Please exiftool(-k).exe, please rename to exiftool.exe and try again.")
+                else:
+                    self.log_message("ERROR", "ExifTool not found in PATH. Please ensure exiftool.exe is available.")
+                return 1
+
+            self.out_base.mkdir(parents=True, exist_ok=True)
+            self._created_dirs: set[str] = set()
+
+            with ExitStack() as daemons:
+                # Every daemon is shut down (-stay_open False) when the block exits
+                self._daemons = queue.Queue()
+                for _ in range(self.workers):
+                    self._daemons.put(daemons.enter_context(ExifToolDaemon(self._exiftool_path)))
+                # Track skipped and copied only counts per year
+                skipped_by_year = {}
+                copied_only_by_year = {}
+
+                for yf, year in self._year_folders():
+                    self.log_message("INFO", "==============================")
+                    self.log_message("INFO", f"START PROCESSING YEAR FOLDER: {yf.name}")
+                    self.log_message("INFO", "==============================")
+                    # If skipped_files_folder is specified, check for YYYY_skipped_files.txt
+                    process_files_set = None
+                    if hasattr(self, '_skipped_files_folder') and self._skipped_files_folder and year:
+                        skipped_file_path = self._skipped_files_folder / f"{year}_skipped_files.txt"
+                        if not skipped_file_path.exists():
+                            self.log_message("INFO", f"Skipped file list {skipped_file_path} not found. Skipping folder {yf.name}.")
+                            continue
+                        # Read only file names from the skipped file list
+                        with open(skipped_file_path, 'r', encoding='utf-8') as f:
+                            process_files_set = set(Path(line.strip()).name for line in f if line.strip())
+
+                    # Skipped and copied only files are written to per-year lists as they happen
+                    self._year = year
+                    self._reset_folder_stats()
+                    self._process_folder(yf, year, process_files_set)
+                    self._close_lists()
+                    if year:
+                        if self.folder_skipped:
+                            skipped_by_year[year] = self.folder_skipped
+                        if self.folder_copied_only:
+                            copied_only_by_year[year] = self.folder_copied_only
+                        self.log_message("INFO", f"YEAR {year} SUMMARY:")
+                        self.log_message("INFO", f"  Processed with metadata: {self.folder_processed}")
+                        self.log_message("INFO", f"  Copied only: {self.folder_copied_only}")
+                        self.log_message("INFO", f"  Skipped: {self.folder_skipped}")
+                        num_rules = get_total_rule_count()
+                        for rule_num in range(1, num_rules + 1):
+                            desc = get_rule_description(rule_num)
+                            self.log_message("INFO", f"  Rule {rule_num} ({desc}) match count: {self.folder_rule_counts.get(rule_num, 0)}")
+                    self._log_buffer.flush()
+                total_skipped = sum(skipped_by_year.values())
+                total_copied_only = sum(copied_only_by_year.values())
+                self.log_message("INFO", f"COMPLETED PROCESSING. Total processed with metadata={self.processed}  Copied only (no metadata update)={self.copied_only}  Skipped={total_skipped}")
+
+                return 0
+        finally:
+            for f in self._list_files.values():
+                f.close()
+            for handler in logger.handlers[:]:
+                handler.close()
+                logger.removeHandler(handler)
+            # MemoryHandler.close() flushes but leaves its target open
+            self._log_file_handler.close()
 
 # ---------- CLI ----------
 
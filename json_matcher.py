@@ -15,105 +15,199 @@ RULE_DESCRIPTIONS = {
     7: "via JSON title",
     8: "filename*.json"
 }
+import os
 import re
 import json
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# Compiled once; match_json runs these for every media file
+_RE_PAREN = re.compile(r"^(.+)\((\d+)\)(\.[^.]+)$")
+_RE_EDITED = re.compile(r"^(.*)-edited(\.[^.]+)$", re.IGNORECASE)
+_RE_MP4_DUP = re.compile(r"^(.+)\(\d+\)\.mp4$", re.IGNORECASE)
+_RE_EXT = re.compile(r"^(.*)(\.[^.]+)$")
+
+try:
+    import orjson  # optional, much faster than the stdlib parser
+except ImportError:
+    orjson = None
+
+JSON_LENGTH_LIMIT = 50  # Max length of Takeout's JSON filenames (incl. .json)
+_UTC = ZoneInfo("UTC")
+
+def scan_tree(root):
+    """Yield file DirEntry objects below root in a single pass.
+
+    DirEntry.is_dir()/is_file() reuse the type returned by the directory read,
+    so unlike Path.rglob no extra stat() is needed per entry. An explicit stack
+    avoids one nested generator per directory level.
+    """
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+@lru_cache(maxsize=4096)
+def local_date(ts: int, tz: ZoneInfo) -> tuple[str, str, str]:
+    """Unix-timestamp-in-UTC → (ExifTool date string, "YYYY", "MM") in local time.
+
+    Cached because burst shots share timestamps.
+    """
+    dt = datetime.fromtimestamp(ts, tz=_UTC).astimezone(tz)
+    return dt.strftime("%Y:%m:%d %H:%M:%S"), str(dt.year), f"{dt.month:02d}"
+
+class JsonIndex:
+    """Lowercase-name index over one folder's JSON files.
+
+    Most rules look for an exact name or a name prefix, which a dict and a
+    sorted name list (searched with bisect) answer without scanning every file.
+    """
+    def __init__(self, json_files: list[Path]):
+        self.by_name = {}
+        for j in json_files:
+            self.by_name.setdefault(j.name.lower(), j)
+        self.names = sorted(self.by_name)
+        self.json_files = json_files
+        self._parsed = {}
+        self._by_title = None
+        self._title_lock = threading.Lock()
+
+    def load(self, path: Path, log_func=None, store=True):
+        """load_json, parsing each file at most once per index.
+
+        With store=False a parse made earlier (e.g. by Rule 7) is reused, but a
+        fresh one is not kept, so one-off reads don't grow the cache.
+        """
+        try:
+            return self._parsed[path]
+        except KeyError:
+            data = load_json(path, log_func)
+            if store:
+                self._parsed[path] = data
+            return data
+
+    def get(self, name: str):
+        return self.by_name.get(name.lower())
+
+    def with_title(self, title: str, log_func=None):
+        """Return the first JSON (in folder order) whose "title" is title, or None.
+
+        The title map is built on first use, since it needs every file parsed.
+        """
+        if self._by_title is None:
+            # Pool workers can get here together; only the first one parses the folder
+            with self._title_lock:
+                if self._by_title is None:
+                    by_title = {}
+                    for j in self.json_files:
+                        data = self.load(j, log_func)
+                        if data and isinstance(data.get("title"), str):
+                            by_title.setdefault(data["title"], j)
+                    self._by_title = by_title
+        return self._by_title.get(title)
+
+    def with_prefix(self, prefix: str):
+        """Yield JSON paths whose name starts with prefix (case-insensitive), in name order."""
+        prefix = prefix.lower()
+        names = self.names
+        i = bisect_left(names, prefix)
+        while i < len(names) and names[i].startswith(prefix):
+            yield self.by_name[names[i]]
+            i += 1
+
+def _found(rule_index, name, j, log_func, rule_counts):
+    desc = RULE_DESCRIPTIONS.get(rule_index, "")
+    if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
+    if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
+    return [j]
 
 def load_json(path: Path, log_func=None):
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        # Both parsers take the raw bytes, skipping a separate decode to str
+        data = path.read_bytes()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
     except Exception as e:
         if log_func:
             log_func("WARNING", f"Could not parse {path}: {e}")
         return None
 
-def match_json(media: Path, json_files: list[Path], log_func=None, rule_counts=None, json_length_limit=50):
+def match_json(media: Path, json_files: list[Path], log_func=None, rule_counts=None, json_length_limit=JSON_LENGTH_LIMIT, json_index=None):
+    """Return [json_path] for the sidecar of media, or [] if no rule matches.
+
+    json_index should be a JsonIndex built once over json_files by callers that
+    match many media files against the same folder.
+    """
+    if json_index is None:
+        json_index = JsonIndex(json_files)
     name = media.name
     # Rule 1 - Direct match (filename.ext*.json)
     rule_index = 1
-    pattern = re.compile(rf"^{re.escape(name)}.*\.json$", re.IGNORECASE)
-    for j in json_files:
-        if pattern.match(j.name):
-            desc = RULE_DESCRIPTIONS.get(rule_index, "")
-            if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-            if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-            return [j]
+    for candidate in (f"{name}.json", f"{name}.supplemental-metadata.json"):
+        j = json_index.get(candidate)
+        if j is not None:
+            return _found(rule_index, name, j, log_func, rule_counts)
+    for j in json_index.with_prefix(name):
+        return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 2 - Truncated match
     rule_index = 2
     if len(name + ".json") > json_length_limit:
         trunc = name[: json_length_limit - 5]
-        for j in json_files:
-            if j.name.lower().startswith(trunc.lower()):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        for j in json_index.with_prefix(trunc):
+            return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 3 - Relaxed parenthetical match
     rule_index = 3
-    m = re.match(r"^(.+)\((\d+)\)(\.[^.]+)$", name)
+    m = _RE_PAREN.match(name)
     if m:
         base = m.group(1)
         num = m.group(2)
         ext = m.group(3)
-        pattern = re.compile(rf"^{re.escape(base)}{re.escape(ext)}.*\({num}\)\.json$", re.IGNORECASE)
-        for j in json_files:
-            if pattern.match(j.name):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        suffix = f"({num}).json"
+        j = json_index.get(base + ext + suffix)
+        if j is not None:
+            return _found(rule_index, name, j, log_func, rule_counts)
+        for j in json_index.with_prefix(base + ext):
+            if j.name.lower().endswith(suffix):
+                return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 4 - Remove '-edited' from filename if present
     rule_index = 4
-    edited_match = re.match(r"^(.*)-edited(\.[^.]+)$", name, re.IGNORECASE)
+    edited_match = _RE_EDITED.match(name)
     if edited_match:
         base_name = edited_match.group(1) + edited_match.group(2)
-        pattern = re.compile(rf"^{re.escape(base_name)}.*\.json$", re.IGNORECASE)
-        for j in json_files:
-            if pattern.match(j.name):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        for j in json_index.with_prefix(base_name):
+            return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 5 - Live photos
     rule_index = 5
     if name.lower().endswith('.mp4'):
         base_name = name[:-4]
-        for j in json_files:
-            if j.name.lower().startswith(base_name.lower()) and j.name.lower().endswith('.json'):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        for j in json_index.with_prefix(base_name):
+            return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 6 - Live photos duplicates
     rule_index = 6
-    m = re.match(r"^(.+)\(\d+\)\.mp4$", name, re.IGNORECASE)
+    m = _RE_MP4_DUP.match(name)
     if m:
         base_name = m.group(1)
-        for j in json_files:
-            if j.name.lower().startswith(base_name.lower()) and j.name.lower().endswith('.json'):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        for j in json_index.with_prefix(base_name):
+            return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 7 - JSON Title field
     rule_index = 7
-    for j in json_files:
-        data = load_json(j, log_func)
-        if data and data.get("title") == name:
-            desc = RULE_DESCRIPTIONS.get(rule_index, "")
-            if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-            if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-            return [j]
+    j = json_index.with_title(name, log_func)
+    if j is not None:
+        return _found(rule_index, name, j, log_func, rule_counts)
     # Rule 8 - filename.ext to filename*.json
     rule_index = 8
-    ext_match = re.match(r"^(.*)(\.[^.]+)$", name, re.IGNORECASE)
+    ext_match = _RE_EXT.match(name)
     if ext_match:
         base_name = ext_match.group(1)
-        pattern = re.compile(rf"^{re.escape(base_name)}.*\.json$", re.IGNORECASE)
-        for j in json_files:
-            if pattern.match(j.name):
-                desc = RULE_DESCRIPTIONS.get(rule_index, "")
-                if log_func: log_func("INFO", f"JSON match - Rule {rule_index} ({desc}): {name} → {j.name}")
-                if rule_counts is not None: rule_counts[rule_index] = rule_counts.get(rule_index, 0) + 1
-                return [j]
+        for j in json_index.with_prefix(base_name):
+            return _found(rule_index, name, j, log_func, rule_counts)
     return []
@@ -22,42 +22,65 @@ Usage:
 
 import argparse
 import json
-from json_matcher import load_json, match_json
+from json_matcher import JsonIndex, local_date, match_json, scan_tree
 import logging
+import os
 import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 DEFAULT_TZ = "America/Los_Angeles"
-UTC = ZoneInfo("UTC")
+_YEAR_FOLDER_RE = re.compile(r"^Photos from (\d{4})$", re.IGNORECASE)
+# "url": "<JSON string>" in a Takeout sidecar's raw bytes
+_URL_RE = re.compile(rb'"url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+def _copy2_or_error(src, dst):
+    """shutil.copy2 that returns the exception instead of raising it (for pool.map)."""
+    try:
+        shutil.copy2(src, dst)
+    except Exception as e:
+        return e
+    return None
+
+def _read_url(path):
+    """Return the "url" value of a Takeout JSON without parsing the whole file."""
+    with open(path, "rb") as f:
+        m = _URL_RE.search(f.read())
+    if not m:
+        return None
+    # Decode just the string literal, so JSON escapes (\/, \uXXXX) are handled
+    return json.loads(b'"' + m.group(1) + b'"')
 
 class ValidationResult:
+    __slots__ = ('total_input_files', 'found_in_output', 'content_matches', 'content_mismatches',
+                 'missing_files', 'errors', 'invalid_date_files', 'orphan_json_files')
+
     def __init__(self):
         self.total_input_files = 0
         self.found_in_output = 0
         self.content_matches = 0
         self.content_mismatches = 0
-        self.missing_files = []
-        self.mismatch_files = []  # Now stores (input_file, output_file, reason)
-        self.errors = []
+        self.missing_files = 0  # Aggregate count
+        self.errors = 0  # Aggregate count
         self.invalid_date_files = 0  # Aggregate count
         self.orphan_json_files = 0  # Aggregate count
 
 class GooglePhotosValidator:
-    def _find_json_for_media(self, media_file: Path, json_files: list[Path]):
-        """Find the best matching JSON file for a given media file using match_json rules."""
-        from json_matcher import match_json
-        matches = match_json(media_file, json_files)
-        return matches[0] if matches else None
-    JSON_LENGTH_LIMIT = 50  # Max length of JSON filename (incl. .json)
-
-    def __init__(self, base_path: Path, output_path: Path = None, time_zone: str = DEFAULT_TZ):
+    def __init__(self, base_path: Path, output_path: Path = None, time_zone: str = DEFAULT_TZ, verbose: bool = False):
         self.base_path = base_path
+        self.verbose = verbose  # also log every size match (DEBUG) to the per-year logs
         self.output_path = output_path or (base_path / "processed")
         self.result = ValidationResult()
         self.time_zone = ZoneInfo(time_zone)
+        # Per-year log: (logger, FileHandler) while a year is being validated
+        self._year_log = None
+        # content_mismatches_<ts>.txt, opened on the first mismatch and written as mismatches are found
+        self._mismatch_fh = None
         # Setup logging to both console and file
         self._setup_logging()
 
@@ -88,26 +111,49 @@ class GooglePhotosValidator:
         
         logging.info("Validation started - logging to %s", log_file)
 
+    def _open_year_log(self, year: str):
+        """Return the logger for {year}_validation.log; _close_year_log closes its file."""
+        year_logger = logging.getLogger(f"year_{year}")
+        year_logger.handlers.clear()
+        formatter = logging.Formatter("%(asctime)s %(levelname)s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        file_handler = logging.FileHandler(self.base_path / f"{year}_validation.log", encoding="utf-8")
+        file_handler.setFormatter(formatter)
+        year_logger.addHandler(file_handler)
+        year_logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
+        self._year_log = (year_logger, file_handler)
+        return year_logger
+
+    def _close_year_log(self):
+        if self._year_log is None:
+            return
+        year_logger, file_handler = self._year_log
+        file_handler.close()
+        year_logger.handlers.clear()
+        self._year_log = None
+
     def _find_year_folders(self):
         """Find all 'Photos from YYYY' folders"""
-        pattern = re.compile(r"^Photos from (\d{4})$", re.IGNORECASE)
         for item in self.base_path.iterdir():
-            if item.is_dir():
-                match = pattern.match(item.name)
-                if match:
-                    yield item, match.group(1)
+            match = _YEAR_FOLDER_RE.match(item.name)
+            if match and item.is_dir():
+                yield item, match.group(1)
+
 
+    def _get_expected_output_path(self, media_file: Path, json_index: JsonIndex):
+        """Determine where this media file should be in the processed output.
 
-    def _get_expected_output_path(self, media_file: Path, json_files: list[Path]):
-        """Determine where this media file should be in the processed output"""
-        matches = match_json(media_file, json_files)
-        json_file = matches[0] if matches else None
-        if not json_file:
-            return None
+        Returns (expected_path, json_file); either may be None. The matched JSON is
+        returned too so callers don't have to run match_json a second time.
+        """
+        matches = match_json(media_file, json_index.json_files, json_index=json_index)
+        if not matches:
+            return None, None
+        json_file = matches[0]
 
-        metadata = load_json(json_file)
+        # Parsed once per year folder; live photos and edited copies share a JSON
+        metadata = json_index.load(json_file)
         if not metadata:
-            return None
+            return None, json_file
 
         # Get timestamp and convert to input time zone 
         timestamp = None
@@ -118,92 +164,140 @@ class GooglePhotosValidator:
                     break
 
         if not timestamp:
-            return None
+            return None, json_file
 
         try:
             # Convert UTC timestamp to specified time zone
-            dt_utc = datetime.fromtimestamp(int(timestamp), tz=UTC)
-            dt_local = dt_utc.astimezone(self.time_zone)
+            _, year, month = local_date(int(timestamp), self.time_zone)
             # Expected path: output/YYYY/MM/filename
-            expected_path = self.output_path / str(dt_local.year) / f"{dt_local.month:02d}" / media_file.name
-            return expected_path
+            expected_path = self.output_path / year / month / media_file.name
+            return expected_path, json_file
         except (ValueError, TypeError):
-            return None
+            return None, json_file
+
+    def _output_stat(self, output_file: Path, output_stats: dict, scanned_dirs: set):
+        """stat() result for an output file, or None if it does not exist.
 
-    def _compare_file_sizes(self, input_file: Path, output_file: Path):
+        output_stats caches results by path; it is pre-filled by the scan of
+        processed/YYYY/MM, whose folders are listed in scanned_dirs. A file missing
+        from a scanned folder is known not to exist, so only outputs in other
+        folders (e.g. another year) cost a syscall.
+        """
+        key = str(output_file)
+        if key not in output_stats:
+            if str(output_file.parent) in scanned_dirs:
+                return None
+            try:
+                output_stats[key] = os.stat(key)
+            except OSError:
+                output_stats[key] = None
+        return output_stats[key]
+
+    def _compare_file_sizes(self, input_entry: os.DirEntry, output_size: int):
         """
         Compare file sizes with expanded logic:
         - Output size can be up to 32 bytes smaller than input
         - Output size should not be more than 10KB larger than input
-        Returns (is_match: bool, reason: str)
+        Returns (is_match: bool, reason: str); for a match the reason is only
+        built with --verbose (it is only logged then) and is None otherwise.
         """
-        if not output_file.exists():
-            return False, "Output file does not exist"
-
         try:
-            input_size = input_file.stat().st_size
-            output_size = output_file.stat().st_size
+            # DirEntry.stat() is served from the directory listing on Windows
+            # and cached after the first call elsewhere
+            input_size = input_entry.stat().st_size
             size_diff = output_size - input_size
 
-            if size_diff < -32:
+            if -32 <= size_diff <= 10240:  # 10KB = 10240 bytes
+                if not self.verbose:
+                    return True, None
+                return True, f"Size acceptable ({input_size} → {output_size}, {'+' if size_diff >= 0 else ''}{size_diff} bytes)"
+            elif size_diff < -32:
                 return False, f"Output smaller than input by more than 32 bytes ({input_size} → {output_size}, {size_diff} bytes)"
-            elif size_diff > 10240:  # 10KB = 10240 bytes
-                return False, f"Output too much larger than input ({input_size} → {output_size}, +{size_diff} bytes)"
             else:
-                return True, f"Size acceptable ({input_size} → {output_size}, {'+' if size_diff >= 0 else ''}{size_diff} bytes)"
+                return False, f"Output too much larger than input ({input_size} → {output_size}, +{size_diff} bytes)"
         except Exception as e:
             return False, f"Error comparing file sizes: {e}"
 
+    def _scan_invalid_dates(self, year: str, output_stats: dict, scanned_dirs: set):
+        """Return output files in processed/YYYY/MM whose modified date is not in that year/month.
+
+        Every file's stat result is recorded in output_stats, and every month folder
+        in scanned_dirs, for the existence and size checks.
+        """
+        processed_base = self.output_path / year
+        invalid_date_files = []
+        if processed_base.exists():
+            for month_folder in processed_base.iterdir():
+                name = month_folder.name
+                # Same test as r"^\d{2}$", without the regex; the name is checked before is_dir() stats it
+                if len(name) == 2 and name.isdecimal() and month_folder.is_dir():
+                    expected_year = int(year)
+                    expected_month = int(name)
+                    with os.scandir(month_folder) as it:
+                        scanned_dirs.add(str(month_folder))
+                        for entry in it:
+                            if entry.is_file() and not entry.name.lower().endswith(".json"):
+                                try:
+                                    st = output_stats[entry.path] = entry.stat()
+                                    mtime = datetime.fromtimestamp(st.st_mtime, tz=self.time_zone)
+                                    if mtime.year != expected_year or mtime.month != expected_month:
+                                        invalid_date_files.append(entry.path)
+                                except Exception:
+                                    pass
+        return invalid_date_files
+
+    def _check_media(self, media_file: Path, media_entry: os.DirEntry, json_index: JsonIndex, output_stats: dict, scanned_dirs: set):
+        """Match, locate and size-check one media file (runs on a worker thread).
+
+        Returns (json_file, expected_output, output_stat, is_match, reason); the
+        caller records the outcome, so nothing shared is updated here.
+        """
+        expected_output, json_file = self._get_expected_output_path(media_file, json_index)
+        output_stat = self._output_stat(expected_output, output_stats, scanned_dirs) if expected_output else None
+        if output_stat is None:
+            return json_file, expected_output, None, None, None
+        is_match, reason = self._compare_file_sizes(media_entry, output_stat.st_size)
+        return json_file, expected_output, output_stat, is_match, reason
+
     def _validate_year_folder(self, year_folder: Path, year: str, wait=False):
         """Validate all media files in a year folder, with per-year log file and orphan JSON detection"""
         # Setup per-year log file
-        year_log_file = self.base_path / f"{year}_validation.log"
-        year_logger = logging.getLogger(f"year_{year}")
-        year_logger.handlers.clear()
-        formatter = logging.Formatter("%(asctime)s %(levelname)s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-        file_handler = logging.FileHandler(year_log_file, encoding="utf-8")
-        file_handler.setFormatter(formatter)
-        year_logger.addHandler(file_handler)
-        year_logger.setLevel(logging.INFO)
+        year_logger = self._open_year_log(year)
 
         year_logger.info("Processing folder: %s", year_folder.name)
 
         # Collect media files and JSON files
         print(f"Scanning all files in '{year_folder.name}' (this may take a few seconds)...")
         media_files = []
+        media_entries = []  # DirEntry per media file, kept for its (cached) stat()
         json_files = []
 
-        for file_path in year_folder.rglob('*'):
-            if file_path.is_file():
-                if file_path.suffix.lower() != ".json":
-                    media_files.append(file_path)
-                elif file_path.suffix.lower() == '.json':
-                    json_files.append(file_path)
+        for entry in scan_tree(year_folder):
+            # One case-insensitive suffix test per entry; only the extension is lowered
+            if entry.name[-5:].lower() == ".json":
+                json_files.append(Path(entry.path))
+            else:
+                media_files.append(Path(entry.path))
+                media_entries.append(entry)
 
         year_logger.info("Found %d media files in %s", len(media_files), year_folder.name)
+        # Built once per year; every media lookup probes it instead of scanning json_files
+        json_index = JsonIndex(json_files)
         self.result.total_input_files += len(media_files)
 
         # Track consumed JSON files
         consumed_jsons = set()
+        # Classified once in the main loop, in media order: no output path could be determined
+        undetermined_files = []
         mismatched_files = []
 
         # --- New validation: check processed/YYYY/MM files for invalid modified date ---
-        processed_base = self.output_path / year
         invalid_date_log = self.base_path / f"{year}_validation_result_invalid_date.txt"
-        invalid_date_files = []
-        if processed_base.exists():
-            for month_folder in processed_base.iterdir():
-                if month_folder.is_dir() and re.match(r"^\d{2}$", month_folder.name):
-                    expected_year = int(year)
-                    expected_month = int(month_folder.name)
-                    for file in month_folder.iterdir():
-                        if file.is_file() and file.suffix.lower() != ".json":
-                            try:
-                                mtime = datetime.fromtimestamp(file.stat().st_mtime, tz=self.time_zone)
-                                if mtime.year != expected_year or mtime.month != expected_month:
-                                    invalid_date_files.append(str(file))
-                            except Exception:
-                                pass
+        # Output file path -> stat result (None if missing); each output file is stat'ed once,
+        # by the scan, and the existence and size checks below are lookups into it
+        output_stats = {}
+        scanned_dirs = set()
+        invalid_date_files = self._scan_invalid_dates(year, output_stats, scanned_dirs)
         if invalid_date_files:
             with open(invalid_date_log, 'w', encoding='utf-8') as f:
                 f.write(f"Files in processed/{year}/MM with invalid modified date\n")
@@ -212,38 +306,35 @@ class GooglePhotosValidator:
                     f.write(f"{fname}\n")
             year_logger.info(f"Invalid date files written to: {invalid_date_log}")
 
-        for media_file in media_files:
-            json_file = self._find_json_for_media(media_file, json_files)
-            expected_output = None
-            if json_file:
-                consumed_jsons.add(json_file)
-                expected_output = self._get_expected_output_path(media_file, json_files)
-            else:
-                expected_output = self._get_expected_output_path(media_file, json_files)
-
-            if not expected_output:
-                self.result.errors.append(f"Could not determine output path for: {media_file}")
-                year_logger.warning("Could not determine output path for: %s", media_file)
-                continue
-
-            if not expected_output.exists():
-                self.result.missing_files.append(str(media_file))
-                year_logger.warning("Missing in output: %s (expected at: %s)", media_file.name, expected_output)
-                continue
-
-            self.result.found_in_output += 1
-
-            # Compare file sizes
-            is_match, reason = self._compare_file_sizes(media_file, expected_output)
-
-            if is_match:
-                self.result.content_matches += 1
-                year_logger.info("Size match: %s - %s", media_file.name, reason)
-            else:
-                self.result.content_mismatches += 1
-                self.result.mismatch_files.append((str(media_file), str(expected_output), reason))
-                mismatched_files.append((str(media_file), str(expected_output), reason))
-                year_logger.warning("Size mismatch: %s - %s", media_file.name, reason)
+        # Matching, JSON reads and stats are I/O-bound, so they run on a thread pool;
+        # results come back in media order and are recorded on this thread
+        with ThreadPoolExecutor() as pool:
+            checks = pool.map(self._check_media, media_files, media_entries, repeat(json_index), repeat(output_stats), repeat(scanned_dirs))
+            for media_file, (json_file, expected_output, output_stat, is_match, reason) in zip(media_files, checks):
+                if json_file:
+                    consumed_jsons.add(json_file)
+                if not expected_output:
+                    undetermined_files.append(media_file)
+                    self.result.errors += 1
+                    year_logger.warning("Could not determine output path for: %s", media_file)
+                    continue
+
+                if output_stat is None:
+                    self.result.missing_files += 1
+                    year_logger.warning("Missing in output: %s (expected at: %s)", media_file.name, expected_output)
+                    continue
+
+                self.result.found_in_output += 1
+
+                if is_match:
+                    self.result.content_matches += 1
+                    # Nearly every file matches; only logged with --verbose
+                    year_logger.debug("Size match: %s - %s", media_file.name, reason)
+                else:
+                    self.result.content_mismatches += 1
+                    self._write_mismatch(str(media_file), str(expected_output), reason)
+                    mismatched_files.append((str(media_file), str(expected_output), reason))
+                    year_logger.warning("Size mismatch: %s - %s", media_file.name, reason)
 
         # After processing, find orphan JSON files
         orphan_jsons = [str(j) for j in json_files if j not in consumed_jsons]
@@ -254,27 +345,12 @@ class GooglePhotosValidator:
                 year_logger.info("  %s", orphan)
                 print(f"  {orphan}")
 
-        # Write invalid date files for this year
-        invalid_date_log = self.base_path / f"{year}_validation_result_invalid_date.txt"
-        if invalid_date_files:
-            with open(invalid_date_log, 'w', encoding='utf-8') as f:
-                f.write(f"Files in processed/{year}/MM with invalid modified date\n")
-                f.write("=" * 50 + "\n")
-                for fname in invalid_date_files:
-                    f.write(f"{fname}\n")
-            year_logger.info(f"Invalid date files written to: {invalid_date_log}")
         # Aggregate count for overall summary
         self.result.invalid_date_files += len(invalid_date_files)
 
-        # Track per-year missing files for overall summary
-        if not hasattr(self.result, 'per_year_missing_files'):
-            self.result.per_year_missing_files = []
-        missing_files = [m for m in media_files if not self._get_expected_output_path(m, json_files) or not (self._get_expected_output_path(m, json_files) and self._get_expected_output_path(m, json_files).exists())]
-        self.result.per_year_missing_files.extend(str(m) for m in missing_files)
-
         # Write missing files for this year
         not_present_file = self.base_path / f"{year}_validation_result_not_present.txt"
-        missing_files = [m for m in media_files if not self._get_expected_output_path(m, json_files)]
+        missing_files = undetermined_files
         if missing_files:
             with open(not_present_file, 'w', encoding='utf-8') as f:
                 f.write(f"Missing output files for year {year}\n")
@@ -311,8 +387,7 @@ class GooglePhotosValidator:
             with open(orphan_json_url_file_path, 'w', encoding='utf-8') as f:
                 for orphan in orphan_jsons:
                     try:
-                        data = self._load_json(Path(orphan))
-                        url = data.get('url') if data else None
+                        url = _read_url(orphan)
                         if url:
                             f.write(f"{url}\n")
                     except Exception:
@@ -321,16 +396,15 @@ class GooglePhotosValidator:
 
             # Create orphan_json/Photos from YYYY/ and copy orphan JSON files
             orphan_json_folder.mkdir(parents=True, exist_ok=True)
-            for orphan in orphan_jsons:
-                try:
-                    src_path = Path(orphan)
-                    dest_path = orphan_json_folder / src_path.name
-                    if src_path.exists():
-                        import shutil
-                        shutil.copy2(src_path, dest_path)
-                        year_logger.info(f"Copied orphan JSON {src_path} to {dest_path}")
-                except Exception as e:
-                    year_logger.warning(f"Failed to copy orphan JSON {orphan}: {e}")
+            # Many small copies, each blocking on I/O: run them on threads, log in order here
+            dest_paths = [orphan_json_folder / Path(orphan).name for orphan in orphan_jsons]
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                errors = pool.map(_copy2_or_error, orphan_jsons, dest_paths)
+                for orphan, dest_path, e in zip(orphan_jsons, dest_paths, errors):
+                    if e is None:
+                        year_logger.info(f"Copied orphan JSON {orphan} to {dest_path}")
+                    else:
+                        year_logger.warning(f"Failed to copy orphan JSON {orphan}: {e}")
         # Aggregate count for overall summary
         self.result.orphan_json_files += len(orphan_jsons)
 
@@ -339,11 +413,11 @@ class GooglePhotosValidator:
         value_width = 6
         year_summary_lines = []
         year_summary_lines.append(f"\nYEAR {year} SUMMARY:")
-        year_summary_lines.append(f"  Total media files:{' ' * (label_width - len('Total media files:'))}{len(media_files):>{value_width}}")
-        year_summary_lines.append(f"  Test 1: Output files not present:{' ' * (label_width - len('Test 1: Output files not present:'))}{len(missing_files):>{value_width}}")
-        year_summary_lines.append(f"  Test 2: Output file size mismatch:{' ' * (label_width - len('Test 2: Output file size mismatch:'))}{len(mismatched_files):>{value_width}}")
-        year_summary_lines.append(f"  Test 3: Output file modified date invalid:{' ' * (label_width - len('Test 3: Output file modified date invalid:'))}{len(invalid_date_files):>{value_width}}")
-        year_summary_lines.append(f"  Test 4: Orphan JSON files:{' ' * (label_width - len('Test 4: Orphan JSON files:'))}{len(orphan_jsons):>{value_width}}")
+        year_summary_lines.append(f"  {'Total media files:':<{label_width}}{len(media_files):>{value_width}}")
+        year_summary_lines.append(f"  {'Test 1: Output files not present:':<{label_width}}{len(missing_files):>{value_width}}")
+        year_summary_lines.append(f"  {'Test 2: Output file size mismatch:':<{label_width}}{len(mismatched_files):>{value_width}}")
+        year_summary_lines.append(f"  {'Test 3: Output file modified date invalid:':<{label_width}}{len(invalid_date_files):>{value_width}}")
+        year_summary_lines.append(f"  {'Test 4: Orphan JSON files:':<{label_width}}{len(orphan_jsons):>{value_width}}")
         for line in year_summary_lines:
             print(line)
         # Write per-year summary to text file
@@ -352,29 +426,35 @@ class GooglePhotosValidator:
             for line in year_summary_lines:
                 f.write(line + "\n")
 
+        # Flush and close this year's log before the (optional) pause for review
+        self._close_year_log()
+
         # Pause for user input after each year only if wait is True
         if wait:
             input(f"\nPress Enter to continue after reviewing year {year}...")
 
-    def _save_mismatch_files(self):
-        """Save mismatched files to a text file"""
-        if not self.result.mismatch_files:
-            return
-            
-        mismatch_file = self.base_path / f"content_mismatches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        
-        with open(mismatch_file, 'w', encoding='utf-8') as f:
+    def _write_mismatch(self, input_file: str, output_file: str, reason: str):
+        """Append one mismatch to the content_mismatches file, creating it on first use"""
+        f = self._mismatch_fh
+        if f is None:
+            mismatch_file = self.base_path / f"content_mismatches_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            f = self._mismatch_fh = open(mismatch_file, 'w', encoding='utf-8')
             f.write("Google Photos Processor - File Size Mismatches\n")
             f.write("=" * 50 + "\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total mismatches: {len(self.result.mismatch_files)}\n\n")
-            
-            for input_file, output_file, reason in self.result.mismatch_files:
-                f.write(f"Input:  {input_file}\n")
-                f.write(f"Output: {output_file}\n")
-                f.write(f"Reason: {reason}\n\n")
-        
-        logging.info("File size mismatches written to: %s", mismatch_file)
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        f.write(f"Input:  {input_file}\n")
+        f.write(f"Output: {output_file}\n")
+        f.write(f"Reason: {reason}\n\n")
+
+    def _close_mismatch_file(self):
+        """Finish the content_mismatches file; the total is only known at the end, so it goes last"""
+        f = self._mismatch_fh
+        if f is None:
+            return
+        f.write(f"Total mismatches: {self.result.content_mismatches}\n")
+        f.close()
+        self._mismatch_fh = None
+        logging.info("File size mismatches written to: %s", f.name)
 
     def validate(self, wait=False):
         """Run the full validation"""
@@ -394,11 +474,12 @@ class GooglePhotosValidator:
 
         logging.info("Found %d year folders to validate", len(year_folders))
 
-        for year_folder, year in year_folders:
-            self._validate_year_folder(year_folder, year, wait=wait)
-
-        # Save mismatch files if any
-        self._save_mismatch_files()
+        try:
+            for year_folder, year in year_folders:
+                self._validate_year_folder(year_folder, year, wait=wait)
+        finally:
+            self._close_year_log()
+            self._close_mismatch_file()
 
         # Print and log summary
         self._print_summary()
@@ -409,22 +490,19 @@ class GooglePhotosValidator:
         """Print validation summary (no timestamps, at end only)"""
         # Print improved overall summary (aligned, descriptive, no timestamps)
         # Use fixed column for numbers (col 42)
-        label_width = 40
         value_col = 42
-        def pad(label):
-            return ' ' * (value_col - len(label))
         print("\n" + "=" * 70)
         print("OVERALL VALIDATION SUMMARY:")
         print("=" * 70)
-        print(f"  Total media files:{pad('Total media files:')}{self.result.total_input_files}")
-        print(f"  Test 1: Output files not present:{pad('Test 1: Output files not present:')}{len(self.result.missing_files)}")
-        print(f"  Test 2: Output file size mismatch:{pad('Test 2: Output file size mismatch:')}{self.result.content_mismatches}")
-        print(f"  Test 3: Output file modified date invalid:{pad('Test 3: Output file modified date invalid:')}{self.result.invalid_date_files}")
-        print(f"  Test 4: Orphan JSON files:{pad('Test 4: Orphan JSON files:')}{self.result.orphan_json_files}")
-        print(f"  Errors:{pad('Errors:')}{len(self.result.errors)}")
+        print(f"  {'Total media files:':<{value_col}}{self.result.total_input_files}")
+        print(f"  {'Test 1: Output files not present:':<{value_col}}{self.result.missing_files}")
+        print(f"  {'Test 2: Output file size mismatch:':<{value_col}}{self.result.content_mismatches}")
+        print(f"  {'Test 3: Output file modified date invalid:':<{value_col}}{self.result.invalid_date_files}")
+        print(f"  {'Test 4: Orphan JSON files:':<{value_col}}{self.result.orphan_json_files}")
+        print(f"  {'Errors:':<{value_col}}{self.result.errors}")
         if self.result.total_input_files > 0:
             success_rate = (self.result.content_matches / self.result.total_input_files) * 100
-            print(f"  Success rate:{pad('Success rate:')}{success_rate:.1f}%")
+            print(f"  {'Success rate:':<{value_col}}{success_rate:.1f}%")
         print("=" * 70)
         # Save detailed report
         report_file = self.base_path / f"validation_summary.txt"
@@ -436,33 +514,22 @@ class GooglePhotosValidator:
             f.write(f"Output path: {self.output_path}\n\n")
             f.write("OVERALL SUMMARY:\n")
             f.write(f"Total media files: {self.result.total_input_files}\n")
-            f.write(f"Test 1: Output files not present: {len(self.result.missing_files)}\n")
+            f.write(f"Test 1: Output files not present: {self.result.missing_files}\n")
             f.write(f"Test 2: Output file size mismatch: {self.result.content_mismatches}\n")
             f.write(f"Test 3: Output file modified date invalid: {self.result.invalid_date_files}\n")
             f.write(f"Test 4: Orphan JSON files: {self.result.orphan_json_files}\n")
-            f.write(f"Errors: {len(self.result.errors)}\n")
+            f.write(f"Errors: {self.result.errors}\n")
             if self.result.total_input_files > 0:
                 f.write(f"Success rate: {success_rate:.1f}%\n\n")
         print(f"Detailed report saved to: {report_file}")
-        print("Note: Overall missing files may differ from per-year missing files if a file is not matched to any year folder, or if output path calculation fails for a file present in input but not in any year folder.")
-        # Write missing files not accounted to any year folder
-        if hasattr(self.result, 'per_year_missing_files'):
-            per_year_missing = set(self.result.per_year_missing_files)
-            unaccounted_missing = [f for f in self.result.missing_files if f not in per_year_missing]
-            if unaccounted_missing:
-                unaccounted_file = self.base_path / "unaccounted_missing_files.txt"
-                with open(unaccounted_file, 'w', encoding='utf-8') as f:
-                    f.write("Missing files not accounted to any year folder\n")
-                    f.write("=" * 50 + "\n")
-                    for fname in unaccounted_missing:
-                        f.write(f"{fname}\n")
-                print(f"Unaccounted missing files written to: {unaccounted_file}")
+
 
 def main():
     parser = argparse.ArgumentParser(description='Validate Google Photos processor output (file size comparison)')
     parser.add_argument('input_path', help='Path to the Google Photos takeout folder')
     parser.add_argument('-o', '--output', help='Path to processed output folder (default: input_path/processed)')
     parser.add_argument('--wait', action='store_true', help='Pause after each year summary')
+    parser.add_argument('--verbose', action='store_true', help='Also log every file whose size matches')
     parser.add_argument('--time-zone', default=DEFAULT_TZ, help='Time zone for date conversion (default: America/Los_Angeles)')
     args = parser.parse_args()
     base_path = Path(args.input_path).resolve()
@@ -470,7 +537,7 @@ def main():
     if not base_path.exists():
         print(f"Error: Input path does not exist: {base_path}")
         sys.exit(1)
-    validator = GooglePhotosValidator(base_path, output_path, time_zone=args.time_zone)
+    validator = GooglePhotosValidator(base_path, output_path, time_zone=args.time_zone, verbose=args.verbose)
     validator.validate(wait=args.wait)
     sys.exit(0)
 